@@ -1,8 +1,18 @@
 import os
+import re
 import json
 from pathlib import Path
 from bs4 import BeautifulSoup
 import shutil
+from catalog_io import atomic_copy, atomic_write_json, atomic_write_text, catalog_lock, file_sha256
+from cover_placeholders import ensure_placeholders
+
+# Manifest mapping logical asset paths to their content-fingerprinted copies
+ASSET_MANIFEST = Path("asset-manifest.json")
+FINGERPRINT_LENGTH = 10
+
+# Game HTML is fingerprinted too when enabled (covers always are)
+FINGERPRINT_GAME_HTML = os.environ.get('FINGERPRINT_GAME_HTML', '').lower() in ('1', 'true', 'yes')
 
 def get_latest_game():
     """Find the most recently created game folder"""
@@ -27,6 +37,113 @@ def get_latest_game():
     latest_game = max(game_folders, key=lambda x: x.stat().st_mtime)
     return latest_game
 
+def file_fingerprint(path):
+    """Return a short content hash for a file"""
+    return file_sha256(path)[:FINGERPRINT_LENGTH]
+
+def fingerprinted_pattern(filename):
+    """Regex matching every fingerprinted copy of a file name (e.g. cover.<hash>.png)"""
+    path = Path(filename)
+    return re.compile(rf"^{re.escape(path.stem)}\.[0-9a-f]{{{FINGERPRINT_LENGTH}}}{re.escape(path.suffix)}$")
+
+def remove_fingerprints(game_folder, filename, keep=()):
+    """Delete fingerprinted copies of a file except the names in `keep`"""
+    pattern = fingerprinted_pattern(filename)
+    for old in game_folder.iterdir():
+        if old.name not in keep and pattern.match(old.name):
+            old.unlink()
+
+def publish_fingerprinted_asset(game_folder, filename, keep=()):
+    """Copy an asset to a content-hashed name next to it and drop stale fingerprints"""
+    source = game_folder / filename
+    if not source.exists():
+        return None
+
+    path = Path(filename)
+    published_name = f"{path.stem}.{file_fingerprint(source)}{path.suffix}"
+    published = game_folder / published_name
+    if not published.exists():
+        atomic_copy(source, published)
+
+    # Garbage-collect fingerprints of older versions, except the retained ones
+    remove_fingerprints(game_folder, filename, {published_name, *keep})
+    return published_name
+
+def publish_game_assets(game, previous_assets):
+    """Publish fingerprinted assets for a game; returns its (assets, retained) manifest entries
+
+    The fingerprint an asset had at the previous sync is retained for one more
+    sync, so cached copies of the hub page that still reference it keep working.
+    """
+    game_folder = Path("games") / game['folder']
+    cover = game.get('cover', 'cover.png')
+    main_file = game.get('main_file', 'index.html')
+
+    assets = {}
+    retained = {}
+    for filename in (cover, main_file):
+        logical = f"games/{game['folder']}/{filename}"
+        previous = previous_assets.get(logical)
+        keep = {Path(previous).name} if previous else set()
+
+        if filename == cover or FINGERPRINT_GAME_HTML:
+            published_name = publish_fingerprinted_asset(game_folder, filename, keep)
+            if published_name:
+                assets[logical] = f"games/{game['folder']}/{published_name}"
+        else:
+            # Fingerprinting was switched off: remove copies left over from earlier syncs
+            remove_fingerprints(game_folder, filename, keep)
+
+        if previous and previous != assets.get(logical):
+            retained[logical] = previous
+    return assets, retained
+
+def load_asset_manifest():
+    """Load the asset manifest, or an empty one if it does not exist yet"""
+    manifest = {"assets": {}, "retained": {}}
+    if ASSET_MANIFEST.exists():
+        with open(ASSET_MANIFEST, 'r') as f:
+            data = json.load(f)
+        if "assets" not in data:
+            # Flat mapping written before retained fingerprints were tracked
+            data = {"assets": data}
+        manifest.update(data)
+    return manifest
+
+def save_asset_manifest(manifest):
+    """Write the asset manifest with stable key ordering"""
+    atomic_write_json(ASSET_MANIFEST, manifest, indent=2, sort_keys=True)
+
+def asset_url(assets, game, key, default):
+    """Resolve a game asset to its fingerprinted URL, falling back to the plain path"""
+    logical = f"games/{game['folder']}/{game.get(key, default)}"
+    return assets.get(logical, logical)
+
+def create_game_card_html(game, assets):
+    """Build the hub card markup for a game"""
+    game_url = asset_url(assets, game, 'main_file', 'index.html')
+    cover_url = asset_url(assets, game, 'cover', 'cover.png')
+
+    background = f"background-image: url('{cover_url}');"
+    placeholder = game.get('placeholder')
+    if placeholder and placeholder.get('image'):
+        # Tiny preview and dominant color paint immediately while the cover downloads
+        background = f"background-image: url('{cover_url}'), url('{placeholder['image']}'); background-color: {placeholder['color']};"
+
+    return f"""
+    <div class="game-card">
+        <a href="{game_url}" style="text-decoration: none;">
+            <div class="game-image" style="{background} background-size: cover; background-position: center;">
+            </div>
+            <div class="game-info">
+                <h2 class="game-title">{game['name']}</h2>
+                <p class="game-description">{game['description']}</p>
+                <span class="play-button">Play Now</span>
+            </div>
+        </a>
+    </div>
+    """
+
 def add_game_to_webpage(game_folder=None):
     """Add a game to the webpage"""
 
@@ -42,71 +159,70 @@ def add_game_to_webpage(game_folder=None):
 
     print(f"Adding game: {metadata['name']}")
 
-    # Read the current HTML file
-    html_file = Path("index.html")
-    with open(html_file, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f.read(), 'html.parser')
-
-    # Find the games grid
-    games_grid = soup.find('div', class_='games-grid')
-    if not games_grid:
-        print("Error: Could not find games grid in HTML")
-        return False
-
-    # Check if game already exists
-    existing_games = games_grid.find_all('div', class_='game-card')
-    for game in existing_games:
-        title_elem = game.find('h2', class_='game-title')
-        if title_elem and metadata['name'] in title_elem.text:
-            print(f"Game '{metadata['name']}' already exists in the webpage")
+    # Hold the catalog lock so concurrent generators and syncs do not lose cards
+    with catalog_lock():
+        # Read the current HTML file
+        html_file = Path("index.html")
+        with open(html_file, 'r', encoding='utf-8') as f:
+            soup = BeautifulSoup(f.read(), 'html.parser')
+
+        # Find the games grid
+        games_grid = soup.find('div', class_='games-grid')
+        if not games_grid:
+            print("Error: Could not find games grid in HTML")
             return False
 
-    # Create new game card HTML
-    game_card_html = f"""
-    <div class="game-card">
-        <a href="games/{metadata['folder']}/index.html" style="text-decoration: none;">
-            <div class="game-image" style="background-image: url('games/{metadata['folder']}/cover.png'); background-size: cover; background-position: center;">
-            </div>
-            <div class="game-info">
-                <h2 class="game-title">{metadata['name']}</h2>
-                <p class="game-description">{metadata['description']}</p>
-                <span class="play-button">Play Now</span>
-            </div>
-        </a>
-    </div>
-    """
+        # Check if game already exists
+        existing_games = games_grid.find_all('div', class_='game-card')
+        for game in existing_games:
+            title_elem = game.find('h2', class_='game-title')
+            if title_elem and metadata['name'] in title_elem.text:
+                print(f"Game '{metadata['name']}' already exists in the webpage")
+                return False
+
+        # Publish fingerprinted assets and record them in the manifest
+        ensure_placeholders([metadata])
+        manifest = load_asset_manifest()
+        prefix = f"games/{metadata['folder']}/"
+        assets, retained = publish_game_assets(metadata, manifest["assets"])
+        for section, entries in (("assets", assets), ("retained", retained)):
+            manifest[section] = {k: v for k, v in manifest[section].items() if not k.startswith(prefix)}
+            manifest[section].update(entries)
+
+        # Create new game card HTML
+        game_card_html = create_game_card_html(metadata, manifest["assets"])
+
+        # Parse the new game card HTML
+        new_game_card = BeautifulSoup(game_card_html, 'html.parser')
 
-    # Parse the new game card HTML
-    new_game_card = BeautifulSoup(game_card_html, 'html.parser')
-
-    # Find the first placeholder game card with "Game" in the title
-    placeholder_found = False
-    for i, game_card in enumerate(existing_games):
-        game_image = game_card.find('div', class_='game-image')
-        if game_image and game_image.text and 'Game' in game_image.text.strip():
-            # Replace this placeholder with the new game
-            game_card.replace_with(new_game_card)
-            placeholder_found = True
-            print(f"Replaced placeholder game {i+1} with '{metadata['name']}'")
-            break
-
-    # If no placeholder found, append the new game
-    if not placeholder_found:
-        games_grid.append(new_game_card)
-        print(f"Added '{metadata['name']}' to the games grid")
-
-    # Update the CSS to handle background images properly
-    style_tag = soup.find('style')
-    if not style_tag:
-        # If using external CSS, we need to update the CSS file
-        css_file = Path("styles.css")
-        if css_file.exists():
-            with open(css_file, 'r') as f:
-                css_content = f.read()
-
-            # Add background-image support if not already present
-            if "background-image:" not in css_content:
-                additional_css = """
+        # Find the first placeholder game card with "Game" in the title
+        placeholder_found = False
+        for i, game_card in enumerate(existing_games):
+            game_image = game_card.find('div', class_='game-image')
+            if game_image and game_image.text and 'Game' in game_image.text.strip():
+                # Replace this placeholder with the new game
+                game_card.replace_with(new_game_card)
+                placeholder_found = True
+                print(f"Replaced placeholder game {i+1} with '{metadata['name']}'")
+                break
+
+        # If no placeholder found, append the new game
+        if not placeholder_found:
+            games_grid.append(new_game_card)
+            print(f"Added '{metadata['name']}' to the games grid")
+
+        # Update the CSS to handle background images properly
+        style_tag = soup.find('style')
+        if not style_tag:
+            # If using external CSS, we need to update the CSS file
+            css_file = Path("styles.css")
+            if css_file.exists():
+                with open(css_file, 'r') as f:
+                    css_content = f.read()
+
+                # Add background-image support if not already present
+                if "background-image:" not in css_content:
+                    additional_css = """
 .game-image[style*="background-image"] {
     background-size: cover !important;
     background-position: center !important;
@@ -124,17 +240,16 @@ def add_game_to_webpage(game_folder=None):
     pointer-events: none;
 }
 """
-                with open(css_file, 'a') as f:
-                    f.write(additional_css)
-                print("Updated CSS file with background image support")
+                    atomic_write_text(css_file, css_content + additional_css)
+                    print("Updated CSS file with background image support")
 
-    # Save the updated HTML
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(str(soup.prettify()))
+        # Save the updated HTML
+        atomic_write_text(html_file, str(soup.prettify()))
+        save_asset_manifest(manifest)
 
-    print(f"✅ Successfully added '{metadata['name']}' to the webpage!")
-    print(f"🎮 Game URL: games/{metadata['folder']}/index.html")
-    return True
+        print(f"✅ Successfully added '{metadata['name']}' to the webpage!")
+        print(f"🎮 Game URL: games/{metadata['folder']}/index.html")
+        return True
 
 def list_all_games():
     """List all available games"""
@@ -156,52 +271,53 @@ def list_all_games():
 
 def sync_games_with_webpage():
     """Sync the webpage with the games folder - display ALL games"""
-    games = list_all_games()
-
-    # Read the current HTML file
-    html_file = Path("index.html")
-    with open(html_file, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f.read(), 'html.parser')
-
-    # Find the games grid
-    games_grid = soup.find('div', class_='games-grid')
-    if not games_grid:
-        print("Error: Could not find games grid in HTML")
-        return False
-
-    # Get all existing game cards
-    existing_cards = games_grid.find_all('div', class_='game-card')
-
-    # Clear all game cards (we'll rebuild from games folder)
-    for card in existing_cards:
-        card.decompose()
-
-    games_added = 0
+    # Hold the catalog lock so concurrent generators and syncs do not lose cards
+    with catalog_lock():
+        games = list_all_games()
+
+        # Read the current HTML file
+        html_file = Path("index.html")
+        with open(html_file, 'r', encoding='utf-8') as f:
+            soup = BeautifulSoup(f.read(), 'html.parser')
+
+        # Find the games grid
+        games_grid = soup.find('div', class_='games-grid')
+        if not games_grid:
+            print("Error: Could not find games grid in HTML")
+            return False
 
-    # Add ALL games from the games folder (no limit)
-    for game in games:
-        game_card_html = f"""
-        <div class="game-card">
-            <a href="games/{game['folder']}/index.html" style="text-decoration: none;">
-                <div class="game-image" style="background-image: url('games/{game['folder']}/cover.png'); background-size: cover; background-position: center;">
-                </div>
-                <div class="game-info">
-                    <h2 class="game-title">{game['name']}</h2>
-                    <p class="game-description">{game['description']}</p>
-                    <span class="play-button">Play Now</span>
-                </div>
-            </a>
-        </div>
-        """
-        new_game_card = BeautifulSoup(game_card_html, 'html.parser')
-        games_grid.append(new_game_card)
-        games_added += 1
-        print(f"✅ Added: {game['name']}")
-
-    # No placeholders - show all actual games only
-    if games_added == 0:
-        # Only add a single placeholder if no games exist at all
-        placeholder_html = f"""
+        # Get all existing game cards
+        existing_cards = games_grid.find_all('div', class_='game-card')
+
+        # Clear all game cards (we'll rebuild from games folder)
+        for card in existing_cards:
+            card.decompose()
+
+        games_added = 0
+
+        # Backfill cover placeholders (cached by cover hash)
+        ensure_placeholders(games)
+
+        # Rebuild the asset manifest from scratch so removed games drop out of it
+        previous_assets = load_asset_manifest()["assets"]
+        manifest = {"assets": {}, "retained": {}}
+        for game in games:
+            assets, retained = publish_game_assets(game, previous_assets)
+            manifest["assets"].update(assets)
+            manifest["retained"].update(retained)
+
+        # Add ALL games from the games folder (no limit)
+        for game in games:
+            game_card_html = create_game_card_html(game, manifest["assets"])
+            new_game_card = BeautifulSoup(game_card_html, 'html.parser')
+            games_grid.append(new_game_card)
+            games_added += 1
+            print(f"✅ Added: {game['name']}")
+
+        # No placeholders - show all actual games only
+        if games_added == 0:
+            # Only add a single placeholder if no games exist at all
+            placeholder_html = f"""
         <div class="game-card">
             <a href="#" style="text-decoration: none;">
                 <div class="game-image">
@@ -215,14 +331,14 @@ def sync_games_with_webpage():
             </a>
         </div>
         """
-        placeholder_card = BeautifulSoup(placeholder_html, 'html.parser')
-        games_grid.append(placeholder_card)
+            placeholder_card = BeautifulSoup(placeholder_html, 'html.parser')
+            games_grid.append(placeholder_card)
 
-    # Save the updated HTML
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(str(soup.prettify()))
+        # Save the updated HTML
+        atomic_write_text(html_file, str(soup.prettify()))
+        save_asset_manifest(manifest)
 
-    return games_added
+        return games_added
 
 if __name__ == "__main__":
     print("=" * 50)
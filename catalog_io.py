@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+# Lock file guarding every catalog mutation (hub page, stylesheet, manifest, game folders)
+CATALOG_LOCK = Path(".catalog.lock")
+
+# Mode given to newly created files (temp files start out private)
+NEW_FILE_MODE = 0o644
+
+@contextmanager
+def catalog_lock(lock_path=CATALOG_LOCK, timeout=300):
+    """Hold an exclusive inter-process lock while the catalog is modified"""
+    lock_path = Path(lock_path)
+    with open(lock_path, 'a+') as lock_file:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for catalog lock: {lock_path}")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def atomic_output(path, mode='w', **kwargs):
+    """Open a temp file next to `path` and rename it into place once written"""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            shutil.copymode(path, tmp_name)
+        else:
+            os.chmod(tmp_name, NEW_FILE_MODE)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+def atomic_write_text(path, text, encoding='utf-8'):
+    """Write text to a file via temp-file-plus-rename"""
+    with atomic_output(path, 'w', encoding=encoding) as f:
+        f.write(text)
+
+def atomic_write_json(path, data, **kwargs):
+    """Write JSON to a file via temp-file-plus-rename"""
+    with atomic_output(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **kwargs)
+
+def atomic_copy(source, destination):
+    """Copy a file so the destination never appears half-written"""
+    with open(source, 'rb') as src, atomic_output(destination, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+
+def file_sha256(path):
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def reserve_game_folder(games_dir, base_folder_name):
+    """Atomically create a unique game folder, appending _2, _3, ... on collisions"""
+    games_dir = Path(games_dir)
+    games_dir.mkdir(parents=True, exist_ok=True)
+
+    folder_name = base_folder_name
+    counter = 2
+    while True:
+        game_folder = games_dir / folder_name
+        try:
+            # mkdir either creates the folder or fails, so two workers never share one
+            game_folder.mkdir()
+            return folder_name, game_folder
+        except FileExistsError:
+            folder_name = f"{base_folder_name}_{counter}"
+            counter += 1
@@ -0,0 +1,76 @@
+import re
+
+SEARCH_MARKER = "<<<<<<< SEARCH"
+DIVIDER_MARKER = "======="
+REPLACE_MARKER = ">>>>>>> REPLACE"
+NO_CHANGES = "NO_CHANGES"
+
+EDIT_PATTERN = re.compile(
+    r"^<<<<<<< SEARCH[ \t]*\n(.*?)^=======[ \t]*\n(.*?)^>>>>>>> REPLACE[ \t]*$",
+    re.DOTALL | re.MULTILINE,
+)
+
+PATCH_FORMAT_INSTRUCTIONS = f"""Return ONLY a list of targeted edits, one block per edit, in exactly this format:
+
+{SEARCH_MARKER}
+exact lines copied from the current code
+{DIVIDER_MARKER}
+replacement lines
+{REPLACE_MARKER}
+
+Rules:
+- The SEARCH text must match the current code exactly and occur only once; include enough surrounding lines to make it unique
+- Keep each edit as small as possible and never repeat the whole file
+- If the code needs no changes, return only {NO_CHANGES}"""
+
+class PatchError(Exception):
+    """Raised when a model's edit list cannot be parsed or applied"""
+
+def parse_edits(text):
+    """Parse SEARCH/REPLACE blocks into (search, replace) pairs; [] means no changes"""
+    text = text.replace("\r\n", "\n")
+    if text.strip() == NO_CHANGES:
+        return []
+    edits = [(search, replace) for search, replace in EDIT_PATTERN.findall(text)]
+    if not edits:
+        raise PatchError("Response contains no edit blocks")
+    markers = len(re.findall(rf"^{re.escape(SEARCH_MARKER)}", text, re.MULTILINE))
+    if markers != len(edits):
+        raise PatchError(f"Response has {markers} SEARCH blocks but only {len(edits)} are complete")
+    for search, _ in edits:
+        if not search.strip():
+            raise PatchError("Edit has an empty SEARCH section")
+    return edits
+
+def find_line_spans(code, search, normalize=lambda line: line):
+    """Locate whole-line occurrences of search in code; returns a list of (start, end) offsets"""
+    code_lines = code.splitlines(keepends=True)
+    code_keys = [normalize(line.rstrip("\r\n")) for line in code_lines]
+    search_lines = [normalize(line) for line in search.splitlines()]
+    offsets = [0]
+    for line in code_lines:
+        offsets.append(offsets[-1] + len(line))
+
+    spans = []
+    for i in range(len(code_lines) - len(search_lines) + 1):
+        if code_keys[i:i + len(search_lines)] == search_lines:
+            spans.append((offsets[i], offsets[i + len(search_lines)]))
+    return spans
+
+def apply_edits(code, edits):
+    """Apply edits in order; every SEARCH must match exactly one run of whole lines"""
+    for index, (search, replace) in enumerate(edits, 1):
+        spans = find_line_spans(code, search)
+        if not spans:
+            # Tolerate trailing-whitespace drift, which models introduce often
+            spans = find_line_spans(code, search, str.rstrip)
+        if not spans:
+            raise PatchError(f"Edit {index}: SEARCH text not found")
+        if len(spans) > 1:
+            raise PatchError(f"Edit {index}: SEARCH text matches {len(spans)} locations")
+
+        start, end = spans[0]
+        if replace and code[start:end].endswith("\n") and not replace.endswith("\n"):
+            replace += "\n"
+        code = code[:start] + replace + code[end:]
+    return code
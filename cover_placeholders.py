@@ -0,0 +1,186 @@
+import base64
+import json
+import os
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageColor
+
+from catalog_io import atomic_write_json, file_sha256
+from svg_covers import local_name
+
+# Width of the tiny blurred preview; height follows the cover's aspect ratio
+PLACEHOLDER_WIDTH = 8
+
+# Size SVG covers are rendered at when the placeholder is derived from their colors
+SVG_PREVIEW_WIDTH = 64
+DEFAULT_ASPECT = 3 / 4
+
+# Below this many covers to (re)compute, a process pool costs more than it saves
+PARALLEL_THRESHOLD = 4
+
+def parse_color(value):
+    """Parse a CSS/SVG color into an (r, g, b) tuple, or None for none, url(...) and the like"""
+    try:
+        return ImageColor.getrgb(value.strip())[:3]
+    except (ValueError, AttributeError):
+        return None
+
+def style_property(element, name):
+    """Read a presentation attribute, letting an inline style declaration override it"""
+    value = element.get(name)
+    for declaration in element.get('style', '').split(';'):
+        key, _, style_value = declaration.partition(':')
+        if key.strip() == name:
+            value = style_value
+    return value
+
+def svg_aspect(root):
+    """Height/width ratio of an SVG from its viewBox or size attributes"""
+    try:
+        view_box = root.get('viewBox')
+        if view_box:
+            _, _, width, height = (float(part) for part in view_box.replace(',', ' ').split())
+        else:
+            width = float(root.get('width', '').removesuffix('px'))
+            height = float(root.get('height', '').removesuffix('px'))
+        return height / width if width > 0 and height > 0 else DEFAULT_ASPECT
+    except ValueError:
+        return DEFAULT_ASPECT
+
+def gradient_coordinate(element, name, default):
+    """A linearGradient coordinate as a fraction ("50%" -> 0.5)"""
+    value = element.get(name, default).strip()
+    try:
+        return float(value[:-1]) / 100 if value.endswith('%') else float(value)
+    except ValueError:
+        return float(default)
+
+def svg_colors(root):
+    """Stop colors of the first gradient, else the first solid fill, plus whether they run vertically"""
+    for element in root.iter():
+        if local_name(element.tag) == 'lineargradient':
+            stops = [parse_color(style_property(stop, 'stop-color') or 'black')
+                     for stop in element if local_name(stop.tag) == 'stop']
+            stops = [color for color in stops if color]
+            if stops:
+                # SVG gradients run left to right unless x1/y1/x2/y2 say otherwise
+                dx = gradient_coordinate(element, 'x2', '1') - gradient_coordinate(element, 'x1', '0')
+                dy = gradient_coordinate(element, 'y2', '0') - gradient_coordinate(element, 'y1', '0')
+                vertical = abs(dy) > abs(dx)
+                return stops, vertical
+    for element in root.iter():
+        color = parse_color(style_property(element, 'fill') or '')
+        if color:
+            return [color], False
+    return [], False
+
+def gradient_image(colors, width=SVG_PREVIEW_WIDTH, height=round(SVG_PREVIEW_WIDTH * DEFAULT_ASPECT), vertical=True):
+    """Render evenly spaced color stops as a linear gradient image"""
+    strip = Image.new('RGB', (len(colors), 1))
+    strip.putdata([tuple(color) for color in colors])
+    if vertical:
+        return strip.transpose(Image.ROTATE_270).resize((width, height), Image.BILINEAR)
+    return strip.resize((width, height), Image.BILINEAR)
+
+def svg_color_image(cover_path):
+    """Approximate an SVG cover from its gradient or fill colors, without a rasterizer"""
+    root = ET.parse(cover_path).getroot()
+    colors, vertical = svg_colors(root)
+    if not colors:
+        return None
+    height = max(1, round(SVG_PREVIEW_WIDTH * svg_aspect(root)))
+    return gradient_image(colors, SVG_PREVIEW_WIDTH, height, vertical)
+
+def open_cover(cover_path):
+    """Open a cover as an RGB image; SVGs are rasterized with cairosvg when it works, else approximated"""
+    if cover_path.suffix.lower() == '.svg':
+        try:
+            from cairosvg import svg2png
+        except (ImportError, OSError):
+            # OSError: cairosvg is installed but the cairo library is missing
+            return svg_color_image(cover_path)
+        png = svg2png(url=str(cover_path), output_width=SVG_PREVIEW_WIDTH)
+        return Image.open(BytesIO(png)).convert('RGB')
+    with Image.open(cover_path) as img:
+        return img.convert('RGB')
+
+def dominant_color(img):
+    """Most common color of a 5-color quantization, as a CSS hex string"""
+    small = img.resize((64, 48))
+    quantized = small.quantize(colors=5)
+    palette = quantized.getpalette()
+    _, index = max(quantized.getcolors())
+    r, g, b = palette[index * 3:index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+def tiny_preview(img):
+    """Downscale to a few pixels and return a PNG data URI the browser blurs when stretched"""
+    height = max(1, round(PLACEHOLDER_WIDTH * img.height / img.width))
+    preview = img.resize((PLACEHOLDER_WIDTH, height), Image.BOX)
+    buffer = BytesIO()
+    preview.save(buffer, format='PNG', optimize=True)
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+def compute_placeholder(cover_path, colors=None):
+    """Compute the placeholder for a cover file; `colors` skips decoding when the gradient is known
+
+    A cover that cannot be decoded gets a placeholder with no color or image, so
+    it is not retried until the cover changes.
+    """
+    cover_path = Path(cover_path)
+    img = None
+    if colors:
+        img = gradient_image(colors)
+    else:
+        try:
+            img = open_cover(cover_path)
+        except Exception as e:
+            print(f"⚠️  Could not read cover {cover_path}: {e}")
+    return {
+        "cover_hash": file_sha256(cover_path),
+        "color": dominant_color(img) if img else None,
+        "image": tiny_preview(img) if img else None,
+    }
+
+def cover_path_for(game, games_dir=Path("games")):
+    """Path of a game's cover file"""
+    return Path(games_dir) / game['folder'] / game.get('cover', 'cover.png')
+
+def placeholder_is_current(game, cover_path):
+    """True when the stored placeholder (or no-placeholder marker) matches the current cover bytes"""
+    placeholder = game.get('placeholder')
+    return bool(placeholder) and placeholder.get('cover_hash') == file_sha256(cover_path)
+
+def ensure_placeholders(games, games_dir=Path("games")):
+    """Fill in missing or stale placeholders in each game's metadata.json, in parallel"""
+    stale = []
+    for game in games:
+        cover_path = cover_path_for(game, games_dir)
+        if cover_path.exists() and not placeholder_is_current(game, cover_path):
+            stale.append((game, cover_path))
+
+    if not stale:
+        return 0
+
+    paths = [str(cover_path) for _, cover_path in stale]
+    if len(stale) >= PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=min(len(stale), os.cpu_count() or 1)) as executor:
+            placeholders = list(executor.map(compute_placeholder, paths))
+    else:
+        placeholders = [compute_placeholder(path) for path in paths]
+
+    updated = 0
+    for (game, cover_path), placeholder in zip(stale, placeholders):
+        game['placeholder'] = placeholder
+        metadata_file = cover_path.parent / "metadata.json"
+        with open(metadata_file, 'r') as f:
+            metadata = json.load(f)
+        metadata['placeholder'] = placeholder
+        atomic_write_json(metadata_file, metadata, indent=2)
+        updated += 1
+
+    print(f"🎨 Computed placeholders for {updated} cover(s)")
+    return updated
@@ -0,0 +1,334 @@
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+
+import google.generativeai as genai
+from PIL import Image
+
+try:
+    from google.api_core.exceptions import ResourceExhausted as RateLimitError
+except ImportError:
+    class RateLimitError(Exception):
+        """429 raised by the fake when google-api-core is not installed"""
+
+# Stages of the generation pipeline, recognised from their prompts
+STAGE_PATTERNS = [
+    ("name", re.compile(r"Generate a creative, catchy")),
+    ("repair_patch", re.compile(r"<<<<<<< SEARCH")),
+    ("validate", re.compile(r"Please review this HTML game code")),
+    ("code", re.compile(r"Create a complete, playable")),
+    ("description", re.compile(r"Write a brief, exciting description")),
+    ("svg_cover", re.compile(r"Create a simple SVG image code")),
+]
+
+CANNED_NAMES = ["Star Catcher", "Nova Drift", "Pixel Parade", "Comet Chase", "Orbit Hop", "Glow Runner"]
+
+CANNED_DESCRIPTIONS = [
+    "Catch falling stars before they hit the ground in this fast, glowing arcade dash. Chain catches for combo points and chase your high score.",
+    "Steer through a shower of comets while the tempo keeps climbing. One slip ends the run, so every dodge counts.",
+]
+
+CANNED_SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="800" height="600">
+<defs><linearGradient id="g" x1="0" y1="0" x2="0" y2="1"><stop offset="0" stop-color="#3a1c71"/><stop offset="1" stop-color="#ffaf7b"/></linearGradient></defs>
+<rect width="800" height="600" fill="url(#g)"/>
+<circle cx="200" cy="180" r="60" fill="#fff" fill-opacity="0.4"/>
+<text x="400" y="320" font-size="64" text-anchor="middle" fill="#fff">GAME</text>
+</svg>"""
+
+CANNED_GAME = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Star Catcher</title>
+<style>
+  body { margin: 0; background: linear-gradient(#1a1a2e, #16213e); display: flex; justify-content: center; align-items: center; height: 100vh; font-family: sans-serif; color: #fff; }
+  canvas { background: #0f0f1f; border-radius: 12px; box-shadow: 0 0 30px rgba(120, 120, 255, 0.4); max-width: 100%; }
+  #info { position: absolute; top: 12px; width: 100%; text-align: center; }
+</style>
+</head>
+<body>
+<div id="info">Move with ← → or the mouse. Catch the stars! Press Space to start.</div>
+<canvas id="game" width="800" height="600"></canvas>
+<script>
+const canvas = document.getElementById('game');
+const ctx = canvas.getContext('2d');
+const state = { running: false, over: false, score: 0, lives: 3, stars: [], particles: [], paddle: { x: 360, w: 80 } };
+const keys = {};
+let audio = null;
+
+function beep(freq, duration) {
+  if (!audio) audio = new (window.AudioContext || window.webkitAudioContext)();
+  const osc = audio.createOscillator();
+  const gain = audio.createGain();
+  osc.frequency.value = freq;
+  gain.gain.setValueAtTime(0.2, audio.currentTime);
+  gain.gain.exponentialRampToValueAtTime(0.001, audio.currentTime + duration);
+  osc.connect(gain).connect(audio.destination);
+  osc.start();
+  osc.stop(audio.currentTime + duration);
+}
+
+function reset() {
+  Object.assign(state, { running: true, over: false, score: 0, lives: 3, stars: [], particles: [] });
+}
+
+function burst(x, y, color) {
+  for (let i = 0; i < 12; i++) {
+    const a = Math.random() * Math.PI * 2;
+    state.particles.push({ x, y, vx: Math.cos(a) * 3, vy: Math.sin(a) * 3, life: 30, color });
+  }
+}
+
+function update() {
+  if (!state.running) return;
+  if (keys.ArrowLeft) state.paddle.x -= 8;
+  if (keys.ArrowRight) state.paddle.x += 8;
+  state.paddle.x = Math.max(0, Math.min(canvas.width - state.paddle.w, state.paddle.x));
+  if (Math.random() < 0.03 + state.score / 5000) {
+    state.stars.push({ x: Math.random() * (canvas.width - 20) + 10, y: -10, vy: 2 + Math.random() * 3 });
+  }
+  for (const star of state.stars) star.y += star.vy;
+  state.stars = state.stars.filter((star) => {
+    if (star.y > 560 && star.x > state.paddle.x && star.x < state.paddle.x + state.paddle.w) {
+      state.score += 10;
+      burst(star.x, star.y, '#ffd700');
+      beep(880, 0.1);
+      return false;
+    }
+    if (star.y > canvas.height) {
+      state.lives -= 1;
+      beep(160, 0.3);
+      if (state.lives <= 0) { state.running = false; state.over = true; }
+      return false;
+    }
+    return true;
+  });
+  for (const p of state.particles) { p.x += p.vx; p.y += p.vy; p.life -= 1; }
+  state.particles = state.particles.filter((p) => p.life > 0);
+}
+
+function draw() {
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  ctx.fillStyle = '#7f5af0';
+  ctx.fillRect(state.paddle.x, 570, state.paddle.w, 12);
+  ctx.font = '24px sans-serif';
+  for (const star of state.stars) ctx.fillText('⭐', star.x - 12, star.y);
+  for (const p of state.particles) { ctx.globalAlpha = p.life / 30; ctx.fillStyle = p.color; ctx.fillRect(p.x, p.y, 3, 3); }
+  ctx.globalAlpha = 1;
+  ctx.fillStyle = '#fff';
+  ctx.fillText(`Score: ${state.score}  Lives: ${state.lives}`, 20, 40);
+  if (!state.running) {
+    ctx.textAlign = 'center';
+    ctx.fillText(state.over ? `Game Over! Score ${state.score} - Space to restart` : 'Press Space to start', canvas.width / 2, canvas.height / 2);
+    ctx.textAlign = 'left';
+  }
+}
+
+function loop() {
+  update();
+  draw();
+  requestAnimationFrame(loop);
+}
+
+window.addEventListener('keydown', (e) => {
+  keys[e.key] = true;
+  if (e.key === ' ' && !state.running) reset();
+});
+window.addEventListener('keyup', (e) => { keys[e.key] = false; });
+canvas.addEventListener('mousemove', (e) => {
+  const rect = canvas.getBoundingClientRect();
+  state.paddle.x = (e.clientX - rect.left) * (canvas.width / rect.width) - state.paddle.w / 2;
+});
+loop();
+</script>
+</body>
+</html>"""
+
+class FakeConfig:
+    """Latency and failure behaviour of the fake models"""
+
+    def __init__(self, latency=0.5, jitter=0.2, image_latency=1.0, error_rate=0.0,
+                 burst_every=0, burst_length=0, imagen_available=True, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.image_latency = image_latency
+        self.error_rate = error_rate
+        # Of every `burst_every` calls, the last `burst_length` are rejected with 429s
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.imagen_available = imagen_available
+        self.random = random.Random(seed)
+
+    def in_burst(self, call_number):
+        """True if the 1-based call is rejected; burst_every=5, burst_length=2 rejects calls 4, 5, 9, 10, ..."""
+        if not self.burst_every:
+            return False
+        return (call_number - 1) % self.burst_every >= self.burst_every - self.burst_length
+
+class CallLog:
+    """Thread-safe record of every fake API call"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = []
+        self.count = 0
+
+    def next_call(self):
+        with self.lock:
+            self.count += 1
+            return self.count
+
+    def record(self, stage, started, outcome, game=None):
+        ended = time.perf_counter()
+        with self.lock:
+            self.calls.append({"stage": stage, "seconds": ended - started, "outcome": outcome,
+                               "game": game, "started": started, "ended": ended})
+
+    def by_stage(self):
+        with self.lock:
+            stages = {}
+            for call in self.calls:
+                stages.setdefault(call["stage"], []).append(call)
+            return stages
+
+    def busy_seconds(self, game):
+        """Wall time during which `game` waited on at least one call (overlapping calls count once)"""
+        with self.lock:
+            intervals = sorted((call["started"], call["ended"]) for call in self.calls if call["game"] == game)
+        busy = 0.0
+        current_start, current_end = None, None
+        for started, ended in intervals:
+            if current_end is None or started > current_end:
+                if current_end is not None:
+                    busy += current_end - current_start
+                current_start, current_end = started, ended
+            else:
+                current_end = max(current_end, ended)
+        if current_end is not None:
+            busy += current_end - current_start
+        return busy
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+class FakeImage:
+    def __init__(self, color):
+        self.color = color
+
+    def save(self, location):
+        Image.new('RGB', (800, 450), self.color).save(location)
+
+class FakeImageResponse:
+    def __init__(self, images):
+        self.images = images
+
+# Shared state used by models created after install()
+config = FakeConfig()
+call_log = CallLog()
+responses = {}
+
+# The generation a thread is working on; models created on that thread attribute their calls to it
+current = threading.local()
+
+def classify_prompt(prompt):
+    """Name the pipeline stage a prompt belongs to"""
+    for stage, pattern in STAGE_PATTERNS:
+        if pattern.search(prompt):
+            return stage
+    return "other"
+
+def simulate_call(stage, latency, game=None):
+    """Sleep for the configured latency and raise injected errors"""
+    call_number = call_log.next_call()
+    delay = max(0.0, latency + config.random.uniform(-config.jitter, config.jitter))
+    started = time.perf_counter()
+    time.sleep(delay)
+
+    if config.in_burst(call_number):
+        call_log.record(stage, started, "rate_limited", game)
+        raise RateLimitError("Resource has been exhausted (fake burst)")
+    if config.random.random() < config.error_rate:
+        call_log.record(stage, started, "error", game)
+        raise RuntimeError("500 Internal error (fake)")
+    return started
+
+def canned_response(stage):
+    """Pick a recorded response for a stage, falling back to the built-in ones"""
+    recorded = responses.get(stage)
+    if recorded:
+        return config.random.choice(recorded)
+    if stage == "name":
+        return config.random.choice(CANNED_NAMES)
+    if stage == "repair_patch":
+        return "NO_CHANGES"
+    if stage in ("code", "validate"):
+        return f"```html\n{CANNED_GAME}\n```"
+    if stage == "description":
+        return config.random.choice(CANNED_DESCRIPTIONS)
+    if stage == "svg_cover":
+        return CANNED_SVG
+    return ""
+
+class FakeGenerativeModel:
+    """Stand-in for genai.GenerativeModel serving canned or recorded responses"""
+
+    def __init__(self, model_name=None, **kwargs):
+        self.model_name = model_name
+        self.game = getattr(current, "game", None)
+
+    def generate_content(self, prompt, **kwargs):
+        stage = classify_prompt(str(prompt))
+        started = simulate_call(stage, config.latency, self.game)
+        text = canned_response(stage)
+        call_log.record(stage, started, "ok", self.game)
+        return FakeResponse(text)
+
+class FakeImageGenerationModel:
+    """Stand-in for genai.ImageGenerationModel producing solid-color images"""
+
+    def __init__(self, model_name=None, **kwargs):
+        if not config.imagen_available:
+            raise RuntimeError(f"Image model {model_name} is not available (fake)")
+        self.model_name = model_name
+        self.game = getattr(current, "game", None)
+
+    def generate_images(self, prompt=None, number_of_images=1, **kwargs):
+        started = simulate_call("image_cover", config.image_latency, self.game)
+        images = [FakeImage(tuple(config.random.randint(40, 255) for _ in range(3))) for _ in range(number_of_images)]
+        call_log.record("image_cover", started, "ok", self.game)
+        return FakeImageResponse(images)
+
+def load_responses(path):
+    """Load recorded responses: a JSON object mapping stage names to lists of texts"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return {stage: list(texts) for stage, texts in json.load(f).items()}
+
+def responses_from_games(games_dir="games"):
+    """Build recorded responses from games already in the repo (names, code, descriptions)"""
+    recorded = {"name": [], "code": [], "description": []}
+    for metadata_file in sorted(Path(games_dir).glob("*/metadata.json")):
+        with open(metadata_file, 'r') as f:
+            metadata = json.load(f)
+        game_file = metadata_file.parent / metadata.get('main_file', 'index.html')
+        if not game_file.exists():
+            continue
+        recorded["name"].append(metadata['name'])
+        recorded["description"].append(metadata['description'])
+        recorded["code"].append(game_file.read_text(encoding='utf-8'))
+    recorded["validate"] = recorded["code"]
+    return recorded
+
+def install(fake_config=None, recorded=None):
+    """Replace the Gemini model classes with the fakes; returns the call log"""
+    global config, call_log, responses
+    config = fake_config or FakeConfig()
+    call_log = CallLog()
+    responses = recorded or {}
+    genai.GenerativeModel = FakeGenerativeModel
+    genai.ImageGenerationModel = FakeImageGenerationModel
+    return call_log
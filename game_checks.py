@@ -0,0 +1,218 @@
+import re
+import shutil
+import subprocess
+import tempfile
+from html.parser import HTMLParser
+from pathlib import Path
+
+# Size band (in bytes) a complete single-file game normally falls into
+MIN_GAME_SIZE = 3000
+MAX_GAME_SIZE = 80000
+
+# Games built on the shared runtime leave the engine out, so they are much smaller
+MIN_RUNTIME_GAME_SIZE = 1500
+
+# Branch points per KB of script above which code is considered convoluted
+MAX_BRANCH_DENSITY = 12
+
+LOOP_PATTERN = re.compile(r"requestAnimationFrame|setInterval\s*\(|Varitas\.loop\s*\(")
+CANVAS_PATTERN = re.compile(r"<canvas\b|getContext\s*\(\s*['\"]2d['\"]", re.IGNORECASE)
+BRANCH_PATTERN = re.compile(r"\b(?:if|for|while|case|catch)\b|&&|\|\||\?")
+FUNCTION_PATTERN = re.compile(r"\bfunction\b|=>")
+RUNTIME_USE_PATTERN = re.compile(r"\bVaritas\.")
+
+# Characters after which a "/" starts a regex literal rather than a division
+REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+
+# Keywords after which a "/" starts a regex literal (e.g. `return /x/.test(s)`)
+REGEX_KEYWORDS = {"return", "typeof", "case", "in", "of", "delete", "void", "throw", "new", "else", "do"}
+
+IDENTIFIER_PATTERN = re.compile(r"[\w$]+")
+
+class ScriptExtractor(HTMLParser):
+    """Collect inline <script> bodies and external script URLs, and note whether the document parses"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.scripts = []
+        self.sources = []
+        self.in_script = False
+        self.tags = set()
+
+    def handle_starttag(self, tag, attrs):
+        self.tags.add(tag)
+        if tag == 'script':
+            src = dict(attrs).get('src')
+            if src:
+                self.sources.append(src.strip())
+            else:
+                self.in_script = True
+                self.scripts.append("")
+
+    def handle_endtag(self, tag):
+        if tag == 'script':
+            self.in_script = False
+
+    def handle_data(self, data):
+        if self.in_script:
+            self.scripts[-1] += data
+
+def skip_template(script, i):
+    """Scan a template literal body from i; return (index, True if stopped at ${) or None"""
+    n = len(script)
+    while i < n:
+        if script[i] == '\\':
+            i += 2
+            continue
+        if script[i] == '`':
+            return i, False
+        if script.startswith('${', i):
+            return i + 1, True
+        i += 1
+    return None
+
+def brackets_balanced(script):
+    """Cheap syntax check: brackets balance outside strings, comments and regexes"""
+    pairs = {')': '(', ']': '[', '}': '{'}
+    stack = []
+    i, n = 0, len(script)
+    last = ''
+    while i < n:
+        c = script[i]
+        if c == '`' or (c == '}' and stack and stack[-1] == '${'):
+            # Template literal body, possibly resuming after a ${...} expression
+            if c == '}':
+                stack.pop()
+            scanned = skip_template(script, i + 1)
+            if scanned is None:
+                return False
+            i, interpolation = scanned
+            if interpolation:
+                stack.append('${')
+        elif c in '"\'':
+            i += 1
+            while i < n and script[i] != c:
+                if script[i] == '\\':
+                    i += 1
+                elif script[i] == '\n':
+                    return False
+                i += 1
+            if i >= n:
+                return False
+        elif script.startswith('//', i):
+            end = script.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        elif script.startswith('/*', i):
+            end = script.find('*/', i + 2)
+            if end == -1:
+                return False
+            i = end + 2
+            continue
+        elif c == '/' and (last == '' or last in REGEX_PRECEDERS or last in REGEX_KEYWORDS):
+            i += 1
+            in_class = False
+            while i < n and (script[i] != '/' or in_class):
+                if script[i] == '\\':
+                    i += 1
+                elif script[i] == '[':
+                    in_class = True
+                elif script[i] == ']':
+                    in_class = False
+                elif script[i] == '\n':
+                    return False
+                i += 1
+        elif c.isalnum() or c in '_$':
+            # Keep whole words in `last` so keywords preceding a regex are recognised
+            last = IDENTIFIER_PATTERN.match(script, i).group()
+            i += len(last)
+            continue
+        elif c in '([{':
+            stack.append(c)
+        elif c in ')]}':
+            if not stack or stack.pop() != pairs[c]:
+                return False
+        if not c.isspace():
+            last = c
+        i += 1
+    return not stack
+
+def node_syntax_ok(script):
+    """Run `node --check` on a script; returns None when Node.js is not installed"""
+    node = shutil.which('node')
+    if not node:
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        script_file = Path(tmp) / "game.js"
+        script_file.write_text(script, encoding='utf-8')
+        try:
+            result = subprocess.run([node, '--check', str(script_file)], capture_output=True, timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+    return result.returncode == 0
+
+def script_syntax_ok(script):
+    """Check a script's syntax with Node.js when available, else by bracket balance"""
+    ok = node_syntax_ok(script)
+    if ok is None:
+        ok = brackets_balanced(script)
+    return ok
+
+def analyze_game_code(code, runtime_script=None):
+    """Statically inspect a generated game and return a report of its properties
+
+    `runtime_script` is the src a game must load to use the shared `Varitas` runtime.
+    """
+    extractor = ScriptExtractor()
+    try:
+        extractor.feed(code)
+        extractor.close()
+        html_ok = 'html' in extractor.tags or 'body' in extractor.tags
+    except Exception:
+        html_ok = False
+
+    script = "\n".join(extractor.scripts)
+    script_kb = max(len(script.encode('utf-8')) / 1024, 1)
+    branches = len(BRANCH_PATTERN.findall(script))
+
+    return {
+        "parses": html_ok and bool(script.strip()) and all(script_syntax_ok(s) for s in extractor.scripts),
+        "has_canvas": bool(CANVAS_PATTERN.search(code)),
+        "has_loop": bool(LOOP_PATTERN.search(script)),
+        "size": len(code.encode('utf-8')),
+        "functions": len(FUNCTION_PATTERN.findall(script)),
+        "branch_density": round(branches / script_kb, 2),
+        "uses_runtime": bool(RUNTIME_USE_PATTERN.search(script)),
+        "loads_runtime": runtime_script is not None and runtime_script in extractor.sources,
+    }
+
+def runtime_ok(report):
+    """False when the game calls Varitas.* without loading the runtime (a ReferenceError on load)"""
+    return report["loads_runtime"] or not report["uses_runtime"]
+
+def passes_checks(report):
+    """True when a report shows no hard failures"""
+    return report["parses"] and report["has_canvas"] and report["has_loop"] and runtime_ok(report)
+
+def score_game_code(report):
+    """Rank a report: hard checks dominate, then size and static complexity"""
+    score = 0.0
+    score += 100 if report["parses"] else 0
+    score += 40 if report["has_canvas"] else 0
+    score += 40 if report["has_loop"] else 0
+    score -= 0 if runtime_ok(report) else 100
+
+    # Truncated or bloated files are both suspicious
+    size = report["size"]
+    min_size = MIN_RUNTIME_GAME_SIZE if report["loads_runtime"] else MIN_GAME_SIZE
+    if size < min_size:
+        score -= 30 * (1 - size / min_size)
+    elif size > MAX_GAME_SIZE:
+        score -= min(30, 30 * (size - MAX_GAME_SIZE) / MAX_GAME_SIZE)
+
+    # Prefer games with some structure but no tangle of branches
+    score += min(report["functions"], 40) / 4
+    if report["branch_density"] > MAX_BRANCH_DENSITY:
+        score -= min(20, report["branch_density"] - MAX_BRANCH_DENSITY)
+
+    return round(score, 2)
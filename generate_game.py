@@ -8,14 +8,191 @@ import colorsys
 import requests
 from io import BytesIO
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from game_types import GAME_TYPES
+from game_checks import analyze_game_code, passes_checks, score_game_code
+from code_patches import PATCH_FORMAT_INSTRUCTIONS, PatchError, apply_edits, parse_edits
+from svg_covers import sanitize_svg
+from catalog_io import atomic_write_json, atomic_write_text, reserve_game_folder
+from cover_placeholders import compute_placeholder
+from xml.sax.saxutils import escape
 
 # Configure Gemini API
 API_KEY = os.environ.get('GEMINI_API_KEY')
 genai.configure(api_key=API_KEY)
 
+# Number of code candidates requested concurrently (best-of-K); 1 keeps a single candidate
+GAME_CANDIDATES = max(1, int(os.environ.get('GAME_CANDIDATES', '1')))
+
+# Validation repair mode: "full" rewrites the whole file, "patch" asks for targeted edits
+GAME_REPAIR_MODE = os.environ.get('GAME_REPAIR_MODE', 'full').lower()
+
+# Code generation target: "inline" self-contained games, "shared" games built on the hub runtime
+GAME_RUNTIME = os.environ.get('GAME_RUNTIME', 'inline').lower()
+
+# Optional callback(stage, seconds) told how long each pipeline stage took (set by load_test.py)
+stage_timing_hook = None
+
+# Versioned shared runtime served from the hub (see runtime/), relative to games/<folder>/
+RUNTIME_VERSION = 1
+RUNTIME_SCRIPT = f"../../runtime/varitas-runtime-v{RUNTIME_VERSION}.js"
+
+RUNTIME_API = f"""The hub provides a shared game runtime. Load it with exactly this tag before your own script:
+<script src="{RUNTIME_SCRIPT}"></script>
+
+It defines a global `Varitas` object:
+- Varitas.fitCanvas(canvas, {{ width, height }}) -> ctx: scales the canvas to the window (high-DPI aware) and keeps a logical width x height coordinate system; ctx.width / ctx.height hold that size
+- Varitas.loop({{ update(dt), render(alpha) }}) -> {{ start(), stop(), pause(), resume(), running }}: fixed 60 Hz update with dt in seconds, render once per frame
+- Varitas.input.isDown(key), Varitas.input.pressed(key): KeyboardEvent.key names such as 'ArrowLeft' or ' '; pressed() is true for one update after the key goes down
+- Varitas.input.pointer {{ x, y, down, pressed }} and Varitas.input.bindCanvas(canvas) to get pointer coordinates in logical canvas space; Varitas.input.onPress(callback) fires on any key or pointer press
+- Varitas.sound.beep({{ freq, duration, type, volume, slide }}), plus presets Varitas.sound.coin(), hit(), jump(), explode(); audio unlocks on the first user gesture automatically
+- Varitas.particles() -> {{ emit(x, y, {{ count, color, speed, life, size, gravity }}), update(dt), render(ctx), clear() }}
+- Varitas.highScore(gameId, score) -> best score, persisted in localStorage
+- Varitas.util.clamp, lerp, rand, randInt, overlaps(a, b) for {{x, y, w, h}} boxes, distance(a, b)
+
+Use the runtime for the game loop, input, sound, particles, resizing and high scores instead of re-implementing them. Write only the game-specific code yourself."""
+
+# Reminder added to repair prompts so fixes keep the runtime instead of inlining it
+RUNTIME_REPAIR_NOTE = f"""The game uses the shared Varitas runtime loaded from "{RUNTIME_SCRIPT}". Keep that script tag and the Varitas API calls; do not inline or replace the runtime."""
+
+# Code generation prompt shared by both runtime targets; CODE_PROMPT_VARIANTS fills in the differences
+CODE_PROMPT_TEMPLATE = """Create a complete, playable {game_type} game called "{game_name}" using HTML5 Canvas and JavaScript.
+{runtime_api}
+Requirements:
+1. {file_requirement}
+2. {canvas_requirement}
+3. Include keyboard/mouse controls with on-screen instructions
+4. {score_requirement}
+5. Include game over and restart functionality
+6. Use modern JavaScript (ES6+)
+7. {effects_requirement}
+8. Make it colorful and visually appealing
+9. {sound_requirement}{extra_requirements}
+
+The game should be:
+- Fully functional and bug-free
+- Fun and engaging
+- Polished with good UI/UX
+- Complete with start screen, game play, and game over screen
+
+Generate the COMPLETE HTML file with ALL {code_scope}. {dependencies}
+Use CSS gradients, Canvas drawing, and emoji for all graphics.
+{closing}"""
+
+CODE_PROMPT_VARIANTS = {
+    'inline': {
+        "runtime_api": "",
+        "file_requirement": "Single HTML file with embedded CSS and JavaScript",
+        "canvas_requirement": "Use HTML5 Canvas for graphics",
+        "score_requirement": "Add score tracking where applicable",
+        "effects_requirement": "Add nice visual effects and smooth animations",
+        "sound_requirement": "Include sound effects using Web Audio API or HTML5 Audio (create simple programmatic sounds)",
+        "extra_requirements": "\n10. Make it responsive to different screen sizes",
+        "code_scope": "code",
+        "dependencies": "Do not use any external dependencies or images.",
+        "closing": "Make sure the game is immediately playable when opened in a browser.",
+    },
+    'shared': {
+        "runtime_api": f"\n{RUNTIME_API}\n",
+        "file_requirement": "Single HTML file with embedded CSS and JavaScript, plus the runtime script tag above",
+        "canvas_requirement": "Use HTML5 Canvas for graphics, sized with Varitas.fitCanvas",
+        "score_requirement": "Add score tracking where applicable, with a high score from Varitas.highScore",
+        "effects_requirement": "Add nice visual effects (Varitas.particles) and smooth animations",
+        "sound_requirement": "Include sound effects with Varitas.sound",
+        "extra_requirements": "",
+        "code_scope": "game code",
+        "dependencies": "Do not use any external dependencies or images other than the runtime.",
+        "closing": "Keep the file compact: the runtime already covers the engine, so do not duplicate it.",
+    },
+}
+
+# Review prompt shared by full-rewrite validation and patch repair, which differ in the
+# instruction line and the response format they ask for
+REVIEW_PROMPT_TEMPLATE = """Please review this HTML game code for "{game_name}" and check if it will work correctly:
+
+{game_code}
+
+{instruction}
+1. Has no JavaScript syntax errors
+2. Has proper event listeners and game initialization
+3. Has all required functions defined
+4. Has proper HTML structure
+5. Will actually run when opened in a browser
+{runtime_note}
+{response_format}"""
+
+FULL_REVIEW_INSTRUCTION = "Please analyze and fix any issues found. Return the corrected HTML code that:"
+PATCH_REVIEW_INSTRUCTION = "Check that it:"
+FULL_REVIEW_FORMAT = "Return ONLY the complete, corrected HTML code without any markdown formatting or explanations."
+
+# Cover format for non-Imagen covers: "png" rasterizes, "svg" publishes the SVG itself
+COVER_FORMAT = os.environ.get('COVER_FORMAT', 'png').lower()
+
+# Vibrant gradient colors for programmatic covers, keyed by game type keyword
+GAME_TYPE_COLORS = {
+    "platformer": [(255, 100, 100), (255, 200, 100)],
+    "puzzle": [(100, 255, 100), (100, 255, 200)],
+    "snake": [(100, 100, 255), (200, 100, 255)],
+    "shooter": [(255, 50, 50), (255, 150, 50)],
+    "memory": [(255, 200, 50), (255, 255, 150)],
+    "maze": [(150, 100, 200), (200, 150, 255)],
+    "racing": [(255, 100, 0), (255, 200, 0)],
+}
+DEFAULT_COVER_COLORS = [(100, 150, 255), (200, 100, 255)]
+
+def extract_html_code(text):
+    """Strip markdown code fences from a model response"""
+    if "```html" in text:
+        text = text.split("```html")[1].split("```")[0]
+    elif "```" in text:
+        text = text.split("```")[1].split("```")[0]
+    return text.strip()
+
+def build_code_prompt(game_type, game_name):
+    """Code generation prompt for the configured GAME_RUNTIME target"""
+    variant = CODE_PROMPT_VARIANTS['shared' if GAME_RUNTIME == 'shared' else 'inline']
+    return CODE_PROMPT_TEMPLATE.format(game_type=game_type, game_name=game_name, **variant)
+
+@contextmanager
+def timed_stage(stage):
+    """Time a pipeline stage, API calls and local work alike, and report it to stage_timing_hook"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stage_timing_hook:
+            stage_timing_hook(stage, time.perf_counter() - started)
+
+def generate_best_code_candidate(model, code_prompt, count):
+    """Request several code candidates concurrently and keep the best-scoring one"""
+    def request_candidate(index):
+        try:
+            return extract_html_code(model.generate_content(code_prompt).text)
+        except Exception as e:
+            print(f"  Candidate {index} failed: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        candidates = [code for code in executor.map(request_candidate, range(1, count + 1)) if code]
+
+    if not candidates:
+        raise RuntimeError("All code candidates failed")
+
+    best_code, best_report, best_score = None, None, None
+    for index, code in enumerate(candidates, 1):
+        report = analyze_game_code(code, RUNTIME_SCRIPT)
+        score = score_game_code(report)
+        print(f"  Candidate {index}: score {score} ({report['size']} bytes, parses={report['parses']}, "
+              f"canvas={report['has_canvas']}, loop={report['has_loop']})")
+        if best_score is None or score > best_score:
+            best_code, best_report, best_score = code, report, score
+
+    return best_code, best_report
+
 def generate_cover_image_with_ai(game_name, game_type, game_description, output_path, model):
-    """Generate a cover image using Gemini's Imagen model"""
+    """Generate a cover image using Gemini's Imagen model; returns the path written or False"""
     try:
         # Create a detailed prompt for image generation
         image_prompt = f"""Create a colorful, vibrant game cover image for a {game_type} called "{game_name}".
@@ -51,7 +228,7 @@ def generate_cover_image_with_ai(game_name, game_type, game_description, output_
                 # Save the generated image
                 response.images[0].save(output_path)
                 print(f"AI-generated cover image saved: {output_path}")
-                return True
+                return output_path
         except:
             # If Imagen fails, try using the text model to create an SVG
             pass
@@ -75,11 +252,21 @@ def generate_cover_image_with_ai(game_name, game_type, game_description, output_
             svg_end = svg_code.index("</svg>") + 6
             svg_code = svg_code[svg_start:svg_end]
 
+            if COVER_FORMAT == 'svg':
+                # Publish the sanitized SVG directly, no rasterization needed
+                svg_code = sanitize_svg(svg_code)
+                if svg_code is None:
+                    raise ValueError("Generated SVG could not be parsed")
+                svg_path = output_path.with_suffix('.svg')
+                atomic_write_text(svg_path, svg_code)
+                print(f"SVG cover image saved: {svg_path} ({len(svg_code)} bytes)")
+                return svg_path
+
             # Convert SVG to PNG using a temporary file
             from cairosvg import svg2png
             svg2png(bytestring=svg_code.encode('utf-8'), write_to=str(output_path))
             print(f"SVG-based cover image saved: {output_path}")
-            return True
+            return output_path
 
     except Exception as e:
         print(f"AI image generation failed: {e}")
@@ -88,33 +275,56 @@ def generate_cover_image_with_ai(game_name, game_type, game_description, output_
     # Fallback to programmatic generation
     return False
 
+def cover_colors(game_type):
+    """Pick the two gradient colors for a programmatic cover"""
+    for key in GAME_TYPE_COLORS:
+        if key in game_type.lower():
+            return GAME_TYPE_COLORS[key]
+    return DEFAULT_COVER_COLORS
+
+def generate_cover_svg_fallback(game_name, game_type, output_path):
+    """Fallback: Generate a simple programmatic SVG cover"""
+    width, height = 800, 600
+    rgb1, rgb2 = cover_colors(game_type)
+
+    circles = []
+    for i in range(8):
+        x = random.randint(100, width - 100)
+        y = random.randint(100, height - 100)
+        size = random.randint(30, 80)
+        opacity = random.randint(30, 100) / 255
+        r, g, b = rgb1 if i % 2 == 0 else rgb2
+        circles.append(f'<circle cx="{x}" cy="{y}" r="{size}" fill="rgb({r},{g},{b})" fill-opacity="{opacity:.2f}"/>')
+
+    title = escape(game_name.upper())
+    subtitle = escape(f"~ {game_type} ~")
+    font = 'font-family="DejaVu Sans,Arial,sans-serif" text-anchor="middle"'
+    svg_code = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<defs><linearGradient id="bg" x1="0" y1="0" x2="0" y2="1">'
+        f'<stop offset="0" stop-color="rgb({",".join(map(str, rgb1))})"/>'
+        f'<stop offset="1" stop-color="rgb({",".join(map(str, rgb2))})"/>'
+        f'</linearGradient></defs>'
+        f'<rect width="{width}" height="{height}" fill="url(#bg)"/>'
+        + "".join(circles) +
+        f'<text x="403" y="303" {font} font-size="60" font-weight="bold" fill="#000">{title}</text>'
+        f'<text x="400" y="300" {font} font-size="60" font-weight="bold" fill="#fff">{title}</text>'
+        f'<text x="402" y="352" {font} font-size="30" fill="#000">{subtitle}</text>'
+        f'<text x="400" y="350" {font} font-size="30" fill="#dcdcdc">{subtitle}</text>'
+        f'</svg>'
+    )
+
+    atomic_write_text(output_path, svg_code)
+    print(f"Programmatic SVG cover image saved: {output_path}")
+    return [rgb1, rgb2]
+
 def generate_cover_image_fallback(game_name, game_type, output_path):
     """Fallback: Generate a simple programmatic cover image"""
     width, height = 800, 600
     img = Image.new('RGB', (width, height))
     draw = ImageDraw.Draw(img)
 
-    # Generate vibrant colors based on game type
-    game_type_colors = {
-        "platformer": [(255, 100, 100), (255, 200, 100)],
-        "puzzle": [(100, 255, 100), (100, 255, 200)],
-        "snake": [(100, 100, 255), (200, 100, 255)],
-        "shooter": [(255, 50, 50), (255, 150, 50)],
-        "memory": [(255, 200, 50), (255, 255, 150)],
-        "maze": [(150, 100, 200), (200, 150, 255)],
-        "racing": [(255, 100, 0), (255, 200, 0)],
-    }
-
-    # Get colors based on game type
-    default_colors = [(100, 150, 255), (200, 100, 255)]
-    for key in game_type_colors:
-        if key in game_type.lower():
-            colors = game_type_colors[key]
-            break
-    else:
-        colors = default_colors
-
-    rgb1, rgb2 = colors
+    rgb1, rgb2 = cover_colors(game_type)
 
     # Create gradient background
     for y in range(height):
@@ -182,7 +392,68 @@ def generate_cover_image_fallback(game_name, game_type, output_path):
     img.save(output_path, quality=95)
     print(f"Programmatic cover image saved: {output_path}")
 
-def generate_game():
+def runtime_repair_note():
+    """Extra repair prompt line for games built on the shared runtime"""
+    return f"\n{RUNTIME_REPAIR_NOTE}\n" if GAME_RUNTIME == 'shared' else ""
+
+def review_prompt(game_name, game_code, instruction, response_format):
+    """Fill in the review prompt shared by validation and patch repair"""
+    return REVIEW_PROMPT_TEMPLATE.format(
+        game_name=game_name,
+        game_code=game_code,
+        instruction=instruction,
+        runtime_note=runtime_repair_note(),
+        response_format=response_format,
+    )
+
+def repair_game_code_with_patches(model, game_name, game_code):
+    """Ask the model for targeted edits and apply them locally; returns None unless the result passes the local checks"""
+    repair_prompt = review_prompt(game_name, game_code, PATCH_REVIEW_INSTRUCTION, PATCH_FORMAT_INSTRUCTIONS)
+
+    repair_response = model.generate_content(repair_prompt)
+    try:
+        edits = parse_edits(repair_response.text)
+        patched_code = apply_edits(game_code, edits)
+    except PatchError as e:
+        print(f"⚠️  Patch repair failed: {e}")
+        return None
+
+    # Only keep the result if it verifies locally, otherwise fall back to a full rewrite
+    if not passes_checks(analyze_game_code(patched_code, RUNTIME_SCRIPT)):
+        print("⚠️  Patched code fails local checks")
+        return None
+
+    if not edits:
+        print("No changes needed")
+    else:
+        print(f"Applied {len(edits)} edit(s)")
+    return patched_code
+
+def validate_game_code(model, game_name, game_code, game_file):
+    """Ask the model to review and fix the game code, then save the result"""
+    print("\n🔍 Validating game code...")
+
+    if GAME_REPAIR_MODE == 'patch':
+        patched_code = repair_game_code_with_patches(model, game_name, game_code)
+        if patched_code is not None:
+            atomic_write_text(game_file, patched_code)
+            print(f"✅ Game code patched and saved: {game_file}")
+            return
+        print("Falling back to full regeneration...")
+
+    validation_prompt = review_prompt(game_name, game_code, FULL_REVIEW_INSTRUCTION, FULL_REVIEW_FORMAT)
+
+    validation_response = model.generate_content(validation_prompt)
+    validated_code = validation_response.text
+
+    # Extract HTML code from response (in case it's wrapped in markdown)
+    validated_code = extract_html_code(validated_code)
+
+    # Save the validated game HTML file
+    atomic_write_text(game_file, validated_code)
+    print(f"✅ Game code validated and saved: {game_file}")
+
+def generate_game(games_dir=Path("games")):
     """Generate a complete game using Gemini API"""
 
     # Randomly select a game type
@@ -201,114 +472,74 @@ def generate_game():
     - Suitable for all ages
     Just return the name, nothing else."""
 
-    name_response = model.generate_content(name_prompt)
-    game_name = name_response.text.strip().replace('"', '').replace("'", "").replace(":", "").replace("/", "-")
-    print(f"Game name: {game_name}")
+    with timed_stage("name"):
+        name_response = model.generate_content(name_prompt)
+        game_name = name_response.text.strip().replace('"', '').replace("'", "").replace(":", "").replace("/", "-")
+        print(f"Game name: {game_name}")
 
-    # Create folder for the game with duplicate name handling
-    base_folder_name = game_name.replace(" ", "_").lower()
-    folder_name = base_folder_name
-    game_folder = Path(f"games/{folder_name}")
+        # Create folder for the game with duplicate name handling
+        base_folder_name = game_name.replace(" ", "_").lower()
 
-    # Check if folder already exists and append number if needed
-    counter = 2
-    while game_folder.exists():
-        folder_name = f"{base_folder_name}_{counter}"
-        game_folder = Path(f"games/{folder_name}")
-        counter += 1
-
-    # Create the unique folder
-    game_folder.mkdir(parents=True, exist_ok=False)
+        # Atomically reserve a unique folder, appending a number if the name is taken
+        folder_name, game_folder = reserve_game_folder(games_dir, base_folder_name)
 
     # Update game name if it was duplicated
+    base_name = game_name
     if folder_name != base_folder_name:
         suffix_num = folder_name.split('_')[-1]
         game_name = f"{game_name} {suffix_num}"
         print(f"⚠️  Duplicate name detected! Renamed to: {game_name}")
 
     # Generate game code
-    code_prompt = f"""Create a complete, playable {game_type} game called "{game_name}" using HTML5 Canvas and JavaScript.
-
-Requirements:
-1. Single HTML file with embedded CSS and JavaScript
-2. Use HTML5 Canvas for graphics
-3. Include keyboard/mouse controls with on-screen instructions
-4. Add score tracking where applicable
-5. Include game over and restart functionality
-6. Use modern JavaScript (ES6+)
-7. Add nice visual effects and smooth animations
-8. Make it colorful and visually appealing
-9. Include sound effects using Web Audio API or HTML5 Audio (create simple programmatic sounds)
-10. Make it responsive to different screen sizes
-
-The game should be:
-- Fully functional and bug-free
-- Fun and engaging
-- Polished with good UI/UX
-- Complete with start screen, game play, and game over screen
-
-Generate the COMPLETE HTML file with ALL code. Do not use any external dependencies or images.
-Use CSS gradients, Canvas drawing, and emoji for all graphics.
-Make sure the game is immediately playable when opened in a browser."""
-
-    code_response = model.generate_content(code_prompt)
-    game_code = code_response.text
-
-    # Extract HTML code from response (in case it's wrapped in markdown)
-    if "```html" in game_code:
-        game_code = game_code.split("```html")[1].split("```")[0]
-    elif "```" in game_code:
-        game_code = game_code.split("```")[1].split("```")[0]
-
-    # Save game HTML file
-    game_file = game_folder / "index.html"
-    with open(game_file, 'w', encoding='utf-8') as f:
-        f.write(game_code.strip())
-    print(f"Game code saved: {game_file}")
-
-    # Validate the generated game code
-    print("\n🔍 Validating game code...")
-    validation_prompt = f"""Please review this HTML game code for "{game_name}" and check if it will work correctly:
-
-{game_code}
-
-Please analyze and fix any issues found. Return the corrected HTML code that:
-1. Has no JavaScript syntax errors
-2. Has proper event listeners and game initialization
-3. Has all required functions defined
-4. Has proper HTML structure
-5. Will actually run when opened in a browser
-
-Return ONLY the complete, corrected HTML code without any markdown formatting or explanations."""
-
-    validation_response = model.generate_content(validation_prompt)
-    validated_code = validation_response.text
-
-    # Extract HTML code from response (in case it's wrapped in markdown)
-    if "```html" in validated_code:
-        validated_code = validated_code.split("```html")[1].split("```")[0]
-    elif "```" in validated_code:
-        validated_code = validated_code.split("```")[1].split("```")[0]
-
-    # Save the validated game HTML file
-    with open(game_file, 'w', encoding='utf-8') as f:
-        f.write(validated_code.strip())
-    print(f"✅ Game code validated and saved: {game_file}")
+    code_prompt = build_code_prompt(game_type, game_name)
+
+    with timed_stage("code"):
+        if GAME_CANDIDATES > 1:
+            print(f"Requesting {GAME_CANDIDATES} code candidates...")
+            game_code, report = generate_best_code_candidate(model, code_prompt, GAME_CANDIDATES)
+        else:
+            code_response = model.generate_content(code_prompt)
+            game_code = extract_html_code(code_response.text)
+            report = None
+
+        # Save game HTML file
+        game_file = game_folder / "index.html"
+        atomic_write_text(game_file, game_code)
+        print(f"Game code saved: {game_file}")
+
+    with timed_stage("validate"):
+        if report is not None and passes_checks(report):
+            # The winning candidate already passed local checks, skip the LLM rewrite
+            print("✅ Best candidate passed local checks, skipping validation")
+        else:
+            validate_game_code(model, game_name, game_code, game_file)
 
     # Generate game description for cover image
     desc_prompt = f"""Write a brief, exciting description (2 sentences max) for a {game_type} called "{game_name}".
     Focus on the gameplay and what makes it fun. Be creative and engaging."""
 
-    desc_response = model.generate_content(desc_prompt)
-    game_description = desc_response.text.strip()
+    with timed_stage("description"):
+        desc_response = model.generate_content(desc_prompt)
+        game_description = desc_response.text.strip()
 
     # Generate cover image
     cover_path = game_folder / "cover.png"
 
-    # Try AI generation first
-    if not generate_cover_image_with_ai(game_name, game_type, game_description, cover_path, model):
-        # Fallback to programmatic generation
-        generate_cover_image_fallback(game_name, game_type, cover_path)
+    with timed_stage("cover"):
+        # Gradient colors of a programmatic SVG cover, so its placeholder needs no rasterizing
+        known_colors = None
+
+        # Try AI generation first
+        generated_cover = generate_cover_image_with_ai(game_name, game_type, game_description, cover_path, model)
+        if generated_cover:
+            cover_path = generated_cover
+        elif COVER_FORMAT == 'svg':
+            # Fallback to programmatic generation
+            cover_path = cover_path.with_suffix('.svg')
+            known_colors = generate_cover_svg_fallback(game_name, game_type, cover_path)
+        else:
+            # Fallback to programmatic generation
+            generate_cover_image_fallback(game_name, game_type, cover_path)
 
     # Save game metadata
     metadata = {
@@ -316,14 +547,21 @@ Return ONLY the complete, corrected HTML code without any markdown formatting or
         "type": game_type,
         "folder": folder_name,
         "description": game_description,
-        "cover": "cover.png",
+        "cover": cover_path.name,
         "main_file": "index.html"
     }
-
-    metadata_file = game_folder / "metadata.json"
-    with open(metadata_file, 'w') as f:
-        json.dump(metadata, f, indent=2)
-    print(f"Metadata saved: {metadata_file}")
+    if game_name != base_name:
+        # Lets a shard merge renumber the game from its real name
+        metadata["base_name"] = base_name
+
+    with timed_stage("placeholder"):
+        # Precompute the card placeholder so the hub paints before the cover loads
+        metadata["placeholder"] = compute_placeholder(cover_path, known_colors)
+
+    with timed_stage("metadata"):
+        metadata_file = game_folder / "metadata.json"
+        atomic_write_json(metadata_file, metadata, indent=2)
+        print(f"Metadata saved: {metadata_file}")
 
     print(f"\n✅ Game '{game_name}' generated successfully!")
     print(f"📁 Location: {game_folder}")
@@ -0,0 +1,203 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import fake_gemini
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unknown"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+def summarize(values):
+    """Count and p50/p90/p99/max of a list of latencies in seconds"""
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else None,
+    }
+
+def run_load_test(games, workers, fake_config, recorded=None, verbose=False):
+    """Drive `games` generations through the fake Gemini models and collect metrics"""
+    call_log = fake_gemini.install(fake_config, recorded)
+
+    # Imported after install() so the pipeline picks up the fake model classes
+    import generate_game as pipeline
+
+    game_latencies = []
+    local_latencies = []
+    failures = []
+    pipeline_timings = {}
+    timings_lock = threading.Lock()
+
+    def record_stage(stage, seconds):
+        with timings_lock:
+            pipeline_timings.setdefault(stage, []).append(seconds)
+
+    pipeline.stage_timing_hook = record_stage
+
+    def run_one(index):
+        fake_gemini.current.game = index
+        started = time.perf_counter()
+        try:
+            pipeline.generate_game()
+            elapsed = time.perf_counter() - started
+            game_latencies.append(elapsed)
+            # Everything the game did besides waiting on the API: checks, patching, covers, writes
+            local_latencies.append(max(0.0, elapsed - call_log.busy_seconds(index)))
+        except Exception as e:
+            failures.append(f"{type(e).__name__}: {e}")
+
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    started = time.perf_counter()
+    with output:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(run_one, range(games)))
+    elapsed = time.perf_counter() - started
+    pipeline.stage_timing_hook = None
+
+    stages = {}
+    for stage, calls in sorted(call_log.by_stage().items()):
+        stats = summarize([call["seconds"] for call in calls if call["outcome"] == "ok"])
+        stats["rate_limited"] = sum(1 for call in calls if call["outcome"] == "rate_limited")
+        stats["errors"] = sum(1 for call in calls if call["outcome"] == "error")
+        stages[stage] = stats
+
+    pipeline_stages = {stage: summarize(timings) for stage, timings in pipeline_timings.items()}
+    pipeline_stages["local"] = summarize(local_latencies)
+
+    return {
+        "games_requested": games,
+        "games_generated": len(game_latencies),
+        "failures": len(failures),
+        "failure_reasons": sorted(set(failures)),
+        "workers": workers,
+        "elapsed_seconds": round(elapsed, 2),
+        "games_per_minute": round(len(game_latencies) / elapsed * 60, 2) if elapsed else None,
+        "game_latency": summarize(game_latencies),
+        "stages": stages,
+        "pipeline_stages": pipeline_stages,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def format_seconds(value):
+    return "-" if value is None else f"{value:.3f}s"
+
+def print_report(report):
+    """Print a human-readable summary of a load-test report"""
+    print("=" * 50)
+    print("LOAD TEST REPORT")
+    print("=" * 50)
+    print(f"Games: {report['games_generated']}/{report['games_requested']} generated, "
+          f"{report['failures']} failed ({report['workers']} workers)")
+    print(f"Elapsed: {report['elapsed_seconds']}s")
+    print(f"Throughput: {report['games_per_minute']} games/minute")
+    print(f"Peak RSS: {report['peak_rss_mb']} MB")
+
+    # API calls: latency percentiles cover successful calls; 429s and errors are counted separately
+    print(f"\n{'api call':<14}{'ok':>7}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}{'429s':>7}{'errors':>8}")
+    for stage, stats in report["stages"].items():
+        print(f"{stage:<14}{stats['count']:>7}"
+              f"{format_seconds(stats['p50']):>10}{format_seconds(stats['p90']):>10}"
+              f"{format_seconds(stats['p99']):>10}{format_seconds(stats['max']):>10}"
+              f"{stats['rate_limited']:>7}{stats['errors']:>8}")
+
+    # Pipeline stages: wall time including local work; "local" is game time not spent waiting on the API
+    print(f"\n{'pipeline stage':<15}{'runs':>6}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    rows = list(report["pipeline_stages"].items()) + [("game (total)", report["game_latency"])]
+    for stage, stats in rows:
+        print(f"{stage:<15}{stats['count']:>6}"
+              f"{format_seconds(stats['p50']):>10}{format_seconds(stats['p90']):>10}"
+              f"{format_seconds(stats['p99']):>10}{format_seconds(stats['max']):>10}")
+
+    if report["failure_reasons"]:
+        print("\nFailure reasons:")
+        for reason in report["failure_reasons"]:
+            print(f"  • {reason}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generate_game.py offline against a fake Gemini API")
+    parser.add_argument("--games", type=int, default=10, help="number of games to generate")
+    parser.add_argument("--workers", type=int, default=1, help="concurrent generations")
+    parser.add_argument("--latency", type=float, default=0.5, help="mean text model latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="uniform +/- latency jitter in seconds")
+    parser.add_argument("--image-latency", type=float, default=1.0, help="mean image model latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls failing with a 500")
+    parser.add_argument("--burst-every", type=int, default=0, help="end every block of N calls with a 429 burst (0 disables)")
+    parser.add_argument("--burst-length", type=int, default=0, help="calls rejected with 429 at the end of each block")
+    parser.add_argument("--no-imagen", action="store_true", help="make the image model unavailable (SVG/programmatic covers)")
+    parser.add_argument("--responses", help="JSON file mapping stage names to recorded responses")
+    parser.add_argument("--from-games", action="store_true", help="replay names, code and descriptions of the games in games/")
+    parser.add_argument("--seed", type=int, help="random seed for latency and error injection")
+    parser.add_argument("--json", help="also write the report to this JSON file")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch directory with generated games")
+    parser.add_argument("--verbose", action="store_true", help="show generator output")
+    args = parser.parse_args()
+
+    fake_config = fake_gemini.FakeConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        image_latency=args.image_latency,
+        error_rate=args.error_rate,
+        burst_every=args.burst_every,
+        burst_length=args.burst_length,
+        imagen_available=not args.no_imagen,
+        seed=args.seed,
+    )
+
+    recorded = {}
+    if args.from_games:
+        recorded.update(fake_gemini.responses_from_games(Path(__file__).parent / "games"))
+    if args.responses:
+        recorded.update(fake_gemini.load_responses(args.responses))
+
+    # Generate into a scratch directory so the real games/ folder is untouched
+    scratch = tempfile.mkdtemp(prefix="varitas-load-test-")
+    json_path = Path(args.json).resolve() if args.json else None
+    os.chdir(scratch)
+    try:
+        report = run_load_test(args.games, args.workers, fake_config, recorded, args.verbose)
+    finally:
+        if args.keep:
+            print(f"Generated games kept in: {scratch}")
+        else:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    print_report(report)
+    if json_path:
+        with open(json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {json_path}")
+
+if __name__ == "__main__":
+    main()
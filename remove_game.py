@@ -2,6 +2,7 @@ import os
 import shutil
 from pathlib import Path
 from add_game_to_webpage import list_all_games, sync_games_with_webpage
+from catalog_io import catalog_lock
 
 def remove_game():
     """Interactively removes a game and updates the webpage."""
@@ -41,16 +42,17 @@ def remove_game():
         print("Deletion cancelled.")
         return
 
-    # Delete the game folder
-    if game_folder_path.exists() and game_folder_path.is_dir():
-        try:
-            shutil.rmtree(game_folder_path)
-            print(f"Successfully deleted game folder: {game_folder_path}")
-        except OSError as e:
-            print(f"Error deleting game folder: {e}")
-            return
-    else:
-        print(f"Game folder not found: {game_folder_path}")
+    # Delete the game folder while no sync is reading it
+    with catalog_lock():
+        if game_folder_path.exists() and game_folder_path.is_dir():
+            try:
+                shutil.rmtree(game_folder_path)
+                print(f"Successfully deleted game folder: {game_folder_path}")
+            except OSError as e:
+                print(f"Error deleting game folder: {e}")
+                return
+        else:
+            print(f"Game folder not found: {game_folder_path}")
 
     # Sync the webpage
     print("\nSyncing webpage to remove the deleted game...")
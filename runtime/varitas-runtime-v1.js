@@ -0,0 +1,305 @@
+/*
+ * Varitas shared game runtime, v1.
+ *
+ * Common engine pieces for generated games: canvas sizing, a fixed-step game
+ * loop, keyboard/pointer input, Web Audio beeps, particles and high scores.
+ * The file name carries the version, so it never changes in place and can be
+ * cached forever; breaking changes ship as varitas-runtime-v2.js.
+ */
+(function (global) {
+    'use strict';
+
+    // ---- Canvas -----------------------------------------------------------
+
+    /**
+     * Scale a canvas to fit its container (or the window) while keeping a
+     * logical width x height coordinate system, sharp on high-DPI screens.
+     * Returns the 2D context; ctx.width / ctx.height hold the logical size.
+     */
+    function fitCanvas(canvas, options) {
+        options = options || {};
+        const width = options.width || 800;
+        const height = options.height || 600;
+        const ctx = canvas.getContext('2d');
+
+        function resize() {
+            const parent = canvas.parentElement;
+            const maxW = options.fullWindow || !parent ? window.innerWidth : parent.clientWidth || window.innerWidth;
+            const maxH = window.innerHeight;
+            const scale = Math.min(maxW / width, maxH / height);
+            const dpr = window.devicePixelRatio || 1;
+
+            canvas.style.width = Math.floor(width * scale) + 'px';
+            canvas.style.height = Math.floor(height * scale) + 'px';
+            canvas.width = Math.floor(width * scale * dpr);
+            canvas.height = Math.floor(height * scale * dpr);
+            ctx.setTransform(scale * dpr, 0, 0, scale * dpr, 0, 0);
+            ctx.viewScale = scale;
+            if (options.onResize) options.onResize(scale);
+        }
+
+        ctx.width = width;
+        ctx.height = height;
+        window.addEventListener('resize', resize);
+        resize();
+        return ctx;
+    }
+
+    // ---- Game loop --------------------------------------------------------
+
+    /**
+     * Fixed-timestep loop. update(dt) runs at `step` seconds (default 1/60),
+     * render(alpha) once per animation frame. Returns { start, stop, pause,
+     * resume, running }.
+     */
+    function loop(handlers) {
+        const step = handlers.step || 1 / 60;
+        const maxFrame = 0.25;
+        let accumulator = 0;
+        let last = 0;
+        let frameId = null;
+        let paused = false;
+
+        function frame(time) {
+            frameId = requestAnimationFrame(frame);
+            const seconds = time / 1000;
+            const elapsed = Math.min(seconds - (last || seconds), maxFrame);
+            last = seconds;
+
+            if (!paused) {
+                accumulator += elapsed;
+                while (accumulator >= step) {
+                    if (handlers.update) handlers.update(step);
+                    input.endFrame();
+                    accumulator -= step;
+                }
+            }
+            if (handlers.render) handlers.render(accumulator / step);
+        }
+
+        const controls = {
+            start() {
+                if (frameId === null) {
+                    last = 0;
+                    frameId = requestAnimationFrame(frame);
+                }
+                return controls;
+            },
+            stop() {
+                if (frameId !== null) cancelAnimationFrame(frameId);
+                frameId = null;
+                accumulator = 0;
+                return controls;
+            },
+            pause() { paused = true; return controls; },
+            resume() { paused = false; last = 0; return controls; },
+            get running() { return frameId !== null && !paused; }
+        };
+        return controls;
+    }
+
+    // ---- Input ------------------------------------------------------------
+
+    const held = new Set();
+    const pressed = new Set();
+    const pointer = { x: 0, y: 0, down: false, pressed: false };
+    const pressListeners = [];
+    let pointerCanvas = null;
+
+    /**
+     * Keyboard and pointer state. Keys use KeyboardEvent.key names
+     * ('ArrowLeft', ' ', 'a', ...). pressed()/pointer.pressed are true for
+     * the single update step after the press.
+     */
+    const input = {
+        pointer,
+        isDown(key) { return held.has(key); },
+        pressed(key) { return pressed.has(key); },
+        onPress(callback) { pressListeners.push(callback); },
+        /** Map pointer coordinates into the logical space of a fitCanvas() canvas. */
+        bindCanvas(canvas) { pointerCanvas = canvas; },
+        endFrame() {
+            pressed.clear();
+            pointer.pressed = false;
+        }
+    };
+
+    const GAME_KEYS = new Set([' ', 'ArrowUp', 'ArrowDown', 'ArrowLeft', 'ArrowRight']);
+
+    window.addEventListener('keydown', (e) => {
+        if (GAME_KEYS.has(e.key)) e.preventDefault();
+        if (!held.has(e.key)) pressed.add(e.key);
+        held.add(e.key);
+        sound.unlock();
+        pressListeners.forEach((cb) => cb({ type: 'key', key: e.key }));
+    });
+    window.addEventListener('keyup', (e) => held.delete(e.key));
+    window.addEventListener('blur', () => held.clear());
+
+    function updatePointer(e) {
+        if (pointerCanvas) {
+            const rect = pointerCanvas.getBoundingClientRect();
+            const ctx = pointerCanvas.getContext('2d');
+            const scale = ctx.viewScale || 1;
+            pointer.x = (e.clientX - rect.left) / scale;
+            pointer.y = (e.clientY - rect.top) / scale;
+        } else {
+            pointer.x = e.clientX;
+            pointer.y = e.clientY;
+        }
+    }
+
+    window.addEventListener('pointerdown', (e) => {
+        updatePointer(e);
+        pointer.down = true;
+        pointer.pressed = true;
+        sound.unlock();
+        pressListeners.forEach((cb) => cb({ type: 'pointer', x: pointer.x, y: pointer.y }));
+    });
+    window.addEventListener('pointermove', updatePointer);
+    window.addEventListener('pointerup', () => { pointer.down = false; });
+
+    // ---- Sound ------------------------------------------------------------
+
+    let audioCtx = null;
+    let muted = false;
+
+    /**
+     * Programmatic Web Audio sounds. The context is created on the first
+     * user gesture, as browsers require.
+     */
+    const sound = {
+        unlock() {
+            if (!audioCtx) {
+                const AudioCtx = global.AudioContext || global.webkitAudioContext;
+                if (!AudioCtx) return;
+                audioCtx = new AudioCtx();
+            }
+            if (audioCtx.state === 'suspended') audioCtx.resume();
+        },
+        /** beep({ freq: 440, duration: 0.1, type: 'square', volume: 0.2, slide: 0 }) */
+        beep(options) {
+            options = options || {};
+            if (muted) return;
+            sound.unlock();
+            if (!audioCtx) return;
+            const now = audioCtx.currentTime;
+            const duration = options.duration || 0.1;
+            const osc = audioCtx.createOscillator();
+            const gain = audioCtx.createGain();
+            osc.type = options.type || 'square';
+            osc.frequency.setValueAtTime(options.freq || 440, now);
+            if (options.slide) {
+                osc.frequency.linearRampToValueAtTime(Math.max(1, (options.freq || 440) + options.slide), now + duration);
+            }
+            gain.gain.setValueAtTime(options.volume || 0.2, now);
+            gain.gain.exponentialRampToValueAtTime(0.001, now + duration);
+            osc.connect(gain).connect(audioCtx.destination);
+            osc.start(now);
+            osc.stop(now + duration);
+        },
+        coin() { sound.beep({ freq: 880, duration: 0.08, type: 'square', slide: 440 }); },
+        hit() { sound.beep({ freq: 160, duration: 0.15, type: 'sawtooth', slide: -100 }); },
+        jump() { sound.beep({ freq: 330, duration: 0.12, type: 'triangle', slide: 330 }); },
+        explode() { sound.beep({ freq: 90, duration: 0.35, type: 'sawtooth', slide: -60, volume: 0.3 }); },
+        setMuted(value) { muted = !!value; },
+        get muted() { return muted; }
+    };
+
+    // ---- Particles --------------------------------------------------------
+
+    /**
+     * Particle system. emit(x, y, { count, color, speed, life, size,
+     * gravity }) spawns a burst; update(dt) and render(ctx) advance and draw.
+     */
+    function particles() {
+        const list = [];
+        return {
+            emit(x, y, options) {
+                options = options || {};
+                const count = options.count || 20;
+                const speed = options.speed || 150;
+                const life = options.life || 0.6;
+                for (let i = 0; i < count; i++) {
+                    const angle = Math.random() * Math.PI * 2;
+                    const velocity = speed * (0.3 + Math.random() * 0.7);
+                    list.push({
+                        x, y,
+                        vx: Math.cos(angle) * velocity,
+                        vy: Math.sin(angle) * velocity,
+                        life, maxLife: life,
+                        size: options.size || 3,
+                        gravity: options.gravity || 0,
+                        color: Array.isArray(options.color)
+                            ? options.color[i % options.color.length]
+                            : options.color || '#ffffff'
+                    });
+                }
+            },
+            update(dt) {
+                for (let i = list.length - 1; i >= 0; i--) {
+                    const p = list[i];
+                    p.life -= dt;
+                    if (p.life <= 0) {
+                        list.splice(i, 1);
+                        continue;
+                    }
+                    p.vy += p.gravity * dt;
+                    p.x += p.vx * dt;
+                    p.y += p.vy * dt;
+                }
+            },
+            render(ctx) {
+                ctx.save();
+                for (const p of list) {
+                    ctx.globalAlpha = Math.max(0, p.life / p.maxLife);
+                    ctx.fillStyle = p.color;
+                    ctx.fillRect(p.x - p.size / 2, p.y - p.size / 2, p.size, p.size);
+                }
+                ctx.restore();
+            },
+            clear() { list.length = 0; },
+            get count() { return list.length; }
+        };
+    }
+
+    // ---- Scores -----------------------------------------------------------
+
+    /** Persist the best score per game; returns the (possibly new) high score. */
+    function highScore(gameId, score) {
+        const key = 'varitas:' + gameId + ':highScore';
+        let best = 0;
+        try {
+            best = Number(localStorage.getItem(key)) || 0;
+            if (typeof score === 'number' && score > best) {
+                best = score;
+                localStorage.setItem(key, String(best));
+            }
+        } catch (e) {
+            // Storage can be unavailable (private mode, file://); scores stay in memory
+        }
+        return Math.max(best, typeof score === 'number' ? score : 0);
+    }
+
+    // ---- Helpers ----------------------------------------------------------
+
+    const util = {
+        clamp: (v, min, max) => Math.max(min, Math.min(max, v)),
+        lerp: (a, b, t) => a + (b - a) * t,
+        rand: (min, max) => min + Math.random() * (max - min),
+        randInt: (min, max) => Math.floor(min + Math.random() * (max - min + 1)),
+        overlaps: (a, b) => a.x < b.x + b.w && a.x + a.w > b.x && a.y < b.y + b.h && a.y + a.h > b.y,
+        distance: (a, b) => Math.hypot(a.x - b.x, a.y - b.y)
+    };
+
+    global.Varitas = Object.freeze({
+        version: 1,
+        fitCanvas,
+        loop,
+        input,
+        sound,
+        particles,
+        highScore,
+        util
+    });
+})(window);
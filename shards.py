@@ -0,0 +1,156 @@
+import argparse
+import json
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from catalog_io import atomic_write_json, catalog_lock, reserve_game_folder
+
+# Each shard generates into STAGING_DIR/<shard id>/<game folder>
+STAGING_DIR = Path("staging")
+GAMES_DIR = Path("games")
+
+SHARD_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+def natural_key(text):
+    """Sort key that orders "shard-2" before "shard-10" """
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", text)]
+
+def run_worker(shard_id, count=1, fake=False):
+    """Generate `count` games into this shard's staging folder"""
+    if not SHARD_ID_PATTERN.match(shard_id):
+        raise ValueError(f"Invalid shard ID: {shard_id!r}")
+
+    if fake:
+        import fake_gemini
+        fake_gemini.install(fake_gemini.FakeConfig(latency=0.05, jitter=0.02, image_latency=0.1))
+
+    # Imported late so the fake (if any) is installed first
+    from generate_game import generate_game
+
+    shard_dir = STAGING_DIR / shard_id
+    generated = 0
+    for i in range(count):
+        print(f"\n[shard {shard_id}] Generating game {i + 1}/{count}...")
+        try:
+            generate_game(games_dir=shard_dir)
+            generated += 1
+        except Exception as e:
+            print(f"[shard {shard_id}] Game generation failed: {e}")
+    print(f"\n[shard {shard_id}] {generated}/{count} game(s) staged in {shard_dir}")
+    return generated
+
+def staged_games(staging_dir):
+    """Yield (shard_id, game_folder, metadata) in deterministic shard/folder order"""
+    if not staging_dir.exists():
+        return
+    for shard_dir in sorted((d for d in staging_dir.iterdir() if d.is_dir()), key=lambda d: natural_key(d.name)):
+        for game_folder in sorted(d for d in shard_dir.iterdir() if d.is_dir()):
+            metadata_file = game_folder / "metadata.json"
+            if not metadata_file.exists():
+                # Incomplete generation: metadata is written last
+                print(f"⚠️  Skipping incomplete game: {game_folder}")
+                continue
+            with open(metadata_file, 'r') as f:
+                yield shard_dir.name, game_folder, json.load(f)
+
+def merge_shards(staging_dir=STAGING_DIR, games_dir=GAMES_DIR, sync=True):
+    """Fold staged games into games/, resolving name collisions, then sync the hub once"""
+    merged = []
+    with catalog_lock():
+        for shard_id, staged_folder, metadata in staged_games(staging_dir):
+            folder_name = metadata['folder']
+            game_name = metadata['name']
+
+            if (games_dir / folder_name).exists():
+                # Collision: number the game from the name the worker picked before suffixing it
+                # (recorded by generate_game()), else from the staged name and folder as they are
+                if 'base_name' in metadata:
+                    base_game_name = metadata['base_name']
+                    base_folder_name = base_game_name.replace(" ", "_").lower()
+                else:
+                    base_game_name, base_folder_name = game_name, folder_name
+                folder_name, game_folder = reserve_game_folder(games_dir, base_folder_name)
+                suffix_num = folder_name[len(base_folder_name) + 1:]
+                game_name = f"{base_game_name} {suffix_num}" if suffix_num else base_game_name
+                if suffix_num:
+                    metadata['base_name'] = base_game_name
+                else:
+                    metadata.pop('base_name', None)
+                print(f"⚠️  '{metadata['name']}' from shard {shard_id} renamed to: {game_name}")
+            else:
+                folder_name, game_folder = reserve_game_folder(games_dir, folder_name)
+
+            for item in sorted(staged_folder.iterdir()):
+                if item.name != "metadata.json":
+                    shutil.move(str(item), str(game_folder / item.name))
+
+            metadata['folder'] = folder_name
+            metadata['name'] = game_name
+            # Metadata goes last so a sync never sees a half-moved game
+            atomic_write_json(game_folder / "metadata.json", metadata, indent=2)
+            shutil.rmtree(staged_folder)
+            merged.append(metadata)
+            print(f"✅ Merged {shard_id}/{staged_folder.name} -> {game_folder}")
+
+        # Drop shard folders that are now empty
+        if staging_dir.exists():
+            for shard_dir in staging_dir.iterdir():
+                if shard_dir.is_dir() and not any(shard_dir.iterdir()):
+                    shard_dir.rmdir()
+
+    if sync and merged:
+        from add_game_to_webpage import sync_games_with_webpage
+        games_count = sync_games_with_webpage()
+        print(f"\n✨ Sync complete! {games_count} game(s) now displayed on webpage")
+
+    return merged
+
+def run_local(workers, count, fake=False):
+    """Run `workers` shard processes in parallel, then merge their output once"""
+    processes = []
+    for shard in range(1, workers + 1):
+        command = [sys.executable, __file__, "worker", "--shard", f"local-{shard}", "--count", str(count)]
+        if fake:
+            command.append("--fake")
+        processes.append((shard, subprocess.Popen(command)))
+
+    failed = [shard for shard, process in processes if process.wait() != 0]
+    if failed:
+        print(f"⚠️  Worker(s) {failed} exited with an error; merging whatever was staged")
+
+    merged = merge_shards()
+    print(f"\n📦 Merged {len(merged)} game(s) from {workers} worker(s)")
+    return merged
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded multi-worker game generation")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    worker = subparsers.add_parser("worker", help="generate games into staging/<shard>")
+    worker.add_argument("--shard", required=True, help="shard ID, e.g. the CI matrix index")
+    worker.add_argument("--count", type=int, default=1, help="games to generate in this shard")
+    worker.add_argument("--fake", action="store_true", help="use the offline Gemini fake")
+
+    merge = subparsers.add_parser("merge", help="fold staged games into games/ and sync the hub")
+    merge.add_argument("--no-sync", action="store_true", help="skip the hub sync")
+
+    run = subparsers.add_parser("run", help="run N local worker processes, then merge")
+    run.add_argument("--workers", type=int, default=2, help="parallel worker processes")
+    run.add_argument("--count", type=int, default=1, help="games per worker")
+    run.add_argument("--fake", action="store_true", help="use the offline Gemini fake")
+
+    args = parser.parse_args()
+    if args.command == "worker":
+        generated = run_worker(args.shard, args.count, args.fake)
+        sys.exit(0 if generated else 1)
+    elif args.command == "merge":
+        merged = merge_shards(sync=not args.no_sync)
+        print(f"\n📦 Merged {len(merged)} game(s)")
+    else:
+        run_local(args.workers, args.count, args.fake)
+
+if __name__ == "__main__":
+    main()
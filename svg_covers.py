@@ -0,0 +1,74 @@
+import re
+import xml.etree.ElementTree as ET
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+
+# Elements that can run code or pull in external content; animation elements can
+# rewrite attributes such as href at runtime, and <style> text can @import or url() anything
+BLOCKED_ELEMENTS = {
+    "script", "foreignobject", "iframe", "embed", "object", "audio", "video", "image",
+    "set", "animate", "animatetransform", "animatemotion", "style",
+}
+
+EXTERNAL_URL_PATTERN = re.compile(r"url\(\s*['\"]?(?!#)", re.IGNORECASE)
+JAVASCRIPT_URL_PATTERN = re.compile(r"(?:^|;)\s*javascript:", re.IGNORECASE)
+NUMBER_PATTERN = re.compile(r"(\d+\.\d{3,})")
+
+ET.register_namespace("", SVG_NS)
+ET.register_namespace("xlink", XLINK_NS)
+
+def local_name(name):
+    """Strip an XML namespace from a tag or attribute name"""
+    return name.rsplit("}", 1)[-1].lower()
+
+def shorten_numbers(value):
+    """Round long decimals in attribute values to two places"""
+    return NUMBER_PATTERN.sub(lambda m: f"{float(m.group(1)):.2f}".rstrip("0").rstrip("."), value)
+
+def clean_element(element):
+    """Drop unsafe children and attributes and squeeze whitespace, recursively"""
+    for child in list(element):
+        if not isinstance(child.tag, str) or local_name(child.tag) in BLOCKED_ELEMENTS:
+            element.remove(child)
+            continue
+        clean_element(child)
+
+    for name, value in list(element.attrib.items()):
+        attr = local_name(name)
+        if attr.startswith("on") or (attr == "href" and not value.startswith("#")):
+            del element.attrib[name]
+        elif EXTERNAL_URL_PATTERN.search(value) or JAVASCRIPT_URL_PATTERN.search(value):
+            del element.attrib[name]
+        else:
+            element.attrib[name] = shorten_numbers(" ".join(value.split()))
+
+    if element.text is not None:
+        element.text = " ".join(element.text.split()) or None
+    if element.tail is not None:
+        element.tail = " ".join(element.tail.split()) or None
+
+def sanitize_svg(svg_code):
+    """Return a sanitized, minified SVG document, or None if it is not valid SVG"""
+    try:
+        root = ET.fromstring(svg_code)
+    except ET.ParseError:
+        return None
+    if local_name(root.tag) != "svg":
+        return None
+
+    clean_element(root)
+    root.tail = None
+
+    # Standalone SVG files need the namespace and a viewBox to scale as a background
+    if not root.tag.startswith("{"):
+        root.set("xmlns", SVG_NS)
+    if "viewBox" not in root.attrib:
+        width = root.get("width", "800").removesuffix("px")
+        height = root.get("height", "600").removesuffix("px")
+        if width.replace(".", "", 1).isdigit() and height.replace(".", "", 1).isdigit():
+            root.set("viewBox", f"0 0 {width} {height}")
+        else:
+            root.set("viewBox", "0 0 800 600")
+
+    return ET.tostring(root, encoding="unicode")